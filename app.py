@@ -1,6 +1,9 @@
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from payroll import parse_period, salary_rollups, validate_wps_run, write_wps_file
 
 def load_data():
     return {
@@ -102,11 +105,54 @@ def main():
         with col1:
             fig = px.pie(df_employees, names="designation", title="Employees by Designation")
             st.plotly_chart(fig, use_container_width=True)
+        sal_by_designation, monthly_sal = salary_rollups(df_employees, df_wps)
         with col2:
-            df_wps["month"] = pd.to_datetime(df_wps["payment_date"]).dt.to_period("M").astype(str)
-            monthly_sal = df_wps.groupby("month")["amount"].sum().reset_index()
-            fig = px.line(monthly_sal, x="month", y="amount", markers=True, title="Monthly Salaries")
+            fig = px.line(monthly_sal, x="month", y="total", markers=True, title="Monthly Salaries")
             st.plotly_chart(fig, use_container_width=True)
+        fig = px.bar(sal_by_designation, x="designation", y="total", title="Salary Cost by Designation")
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.write("**WPS Payroll Run**")
+        run_month = st.text_input("Payroll Month (YYYY-MM)", pd.Timestamp.today().strftime("%Y-%m"))
+        employer_id = st.text_input("WPS Employer ID", os.environ.get("WPS_EMPLOYER_ID", ""))
+        bank_code = st.text_input("WPS Bank Routing Code", os.environ.get("WPS_BANK_CODE", ""))
+        try:
+            period = parse_period(run_month)
+        except ValueError as exc:
+            period = None
+            st.error(str(exc))
+        col1, col2 = st.columns(2)
+        generate = col1.button("Generate WPS File", disabled=period is None)
+        reconcile = col2.button("Reconcile Recorded Transfers", disabled=period is None,
+                                help="Compare a closed month's Paid transfers against employee records")
+        if generate:
+            sif_name = f"wps_run_{period.strftime('%Y-%m')}.sif"
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                try:
+                    sif_path = write_wps_file(
+                        df_employees, period, os.path.join(tmp_dir, sif_name), employer_id, bank_code
+                    )
+                except ValueError as exc:
+                    st.error(str(exc))
+                else:
+                    with open(sif_path, "rb") as fh:
+                        sif_data = fh.read()
+                    st.download_button("Download SIF", sif_data, file_name=sif_name)
+        if reconcile:
+            if period.end_time >= pd.Timestamp.today():
+                st.warning(f"{period.strftime('%Y-%m')} has not closed yet; reconcile it once salaries are paid.")
+            else:
+                checks = validate_wps_run(df_employees, df_wps, period)
+                col1, col2, col3, col4, col5 = st.columns(5)
+                col1.metric("Missing Transfers", len(checks["missing"]))
+                col2.metric("Duplicate Transfers", len(checks["duplicates"]))
+                col3.metric("Unexpected Transfers", len(checks["unexpected"]))
+                col4.metric("Salary Mismatches", len(checks["mismatched"]))
+                col5.metric("Incomplete Records", len(checks["incomplete"]))
+                for label, df_check in checks.items():
+                    if not df_check.empty:
+                        st.write(f"**{label.capitalize()}**")
+                        st.dataframe(df_check)
 
     with tab4:
         st.subheader("🔮 Predictive Analytics")
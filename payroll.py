@@ -0,0 +1,165 @@
+import re
+
+import pandas as pd
+
+CHUNK_SIZE = 10000
+PERIOD_RE = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+IBAN_RE = r"[A-Z]{2}\d{2}[A-Z0-9]{11,30}"
+
+
+def parse_period(period):
+    """Parse a payroll month given strictly as YYYY-MM."""
+    if isinstance(period, pd.Period):
+        return period.asfreq("M")
+    if not isinstance(period, str) or not PERIOD_RE.fullmatch(period.strip()):
+        raise ValueError(f"Payroll month must be YYYY-MM, got {period!r}")
+    return pd.Period(period.strip(), freq="M")
+
+
+def _period_bounds(period):
+    month = parse_period(period)
+    return month, month.start_time.normalize(), month.end_time.normalize()
+
+
+def _active_employees(df_employees, end):
+    """Active employees who had joined by `end`; unknown joining dates are kept."""
+    active = df_employees.loc[
+        df_employees["status"] == "Active",
+        ["emp_id", "name", "designation", "salary", "bank_details", "joining_date"],
+    ].copy()
+    active["joining_date"] = pd.to_datetime(active["joining_date"], errors="coerce")
+    return active[~(active["joining_date"] > end)]
+
+
+def _paid_transfers(df_wps):
+    return df_wps[df_wps["status"] == "Paid"]
+
+
+def _incomplete_mask(active):
+    """Rows that cannot go into a SIF: no joining date, bad IBAN or non-positive salary."""
+    iban = active["bank_details"].astype("string").str.strip()
+    salary = pd.to_numeric(active["salary"], errors="coerce")
+    return (
+        active["joining_date"].isna()
+        | ~iban.str.fullmatch(IBAN_RE).fillna(False).astype(bool)
+        | ~(salary > 0)
+    )
+
+
+def generate_wps_run(df_employees, period, employer_id, bank_code, chunk_size=CHUNK_SIZE):
+    """Yield the SIF salary file for `period` (YYYY-MM) in text chunks.
+
+    One EDR line per active employee, followed by the SCR control record.
+    Employees who join mid-month are paid pro rata from their joining date;
+    those joining after the period are left out. Totals are accumulated
+    chunk by chunk so the file is never held in memory. Raises ValueError
+    before yielding anything if the period, employer ID or bank routing code
+    is invalid, or an active employee has no joining date, a malformed IBAN
+    or a non-positive salary.
+    """
+    month, start, end = _period_bounds(period)
+    employer_id, bank_code = str(employer_id or "").strip(), str(bank_code or "").strip()
+    if not employer_id or not bank_code:
+        raise ValueError("WPS employer ID and bank routing code must be configured")
+    active = _active_employees(df_employees, end)
+    incomplete = _incomplete_mask(active)
+    if incomplete.any():
+        ids = ", ".join(active.loc[incomplete, "emp_id"].astype(str).head(10))
+        raise ValueError(
+            f"{incomplete.sum()} active employee(s) with missing joining date, invalid IBAN or salary: {ids}"
+        )
+    end_str = end.strftime("%Y-%m-%d")
+
+    count, total = 0, 0.0
+    for offset in range(0, len(active), chunk_size):
+        chunk = active.iloc[offset:offset + chunk_size]
+        pay_start = chunk["joining_date"].clip(lower=start)
+        days = (end - pay_start).dt.days + 1
+        salary = (chunk["salary"].astype(float) * days / month.days_in_month).round(2)
+        lines = (
+            "EDR," + chunk["emp_id"].astype(str)
+            + "," + bank_code
+            + "," + chunk["bank_details"].astype(str).str.strip()
+            + "," + pay_start.dt.strftime("%Y-%m-%d") + "," + end_str + "," + days.astype(str)
+            + "," + salary.map("{:.2f}".format)
+            + ",0.00,0\n"
+        )
+        count += len(chunk)
+        total += salary.sum()
+        yield "".join(lines.tolist())
+
+    now = pd.Timestamp.now()
+    yield (
+        f"SCR,{employer_id},{bank_code},{now:%Y-%m-%d},{now:%H%M},{month.strftime('%m%Y')},"
+        f"{count},{total:.2f},AED,WPS-{month.strftime('%Y%m')}\n"
+    )
+
+
+def write_wps_file(df_employees, period, path, employer_id, bank_code, **kwargs):
+    chunks = generate_wps_run(df_employees, period, employer_id, bank_code, **kwargs)
+    first = next(chunks)  # surfaces validation errors before the file is created
+    with open(path, "w", newline="") as fh:
+        fh.write(first)
+        for chunk in chunks:
+            fh.write(chunk)
+    return path
+
+
+def validate_wps_run(df_employees, df_wps, period):
+    """Check a payroll run for `period` against the recorded WPS transfers.
+
+    Only transfers with status "Paid" count, and only employees who had joined
+    by the end of the period are expected to be paid. Meant for closed
+    periods. Returns a dict of DataFrames:
+      - missing: active employees with no transfer in the period
+      - duplicates: employees with more than one transfer in the period
+      - unexpected: transfers in the period to inactive or unknown employees
+      - mismatched: active employees whose salary differs from their last
+        transfer before the period
+      - incomplete: active employees with no joining date, an invalid IBAN
+        or a non-positive salary
+    """
+    _, start, end = _period_bounds(period)
+    active = _active_employees(df_employees, end)
+    wps = _paid_transfers(df_wps)[["wps_id", "emp_id", "amount", "payment_date"]].copy()
+    wps["payment_date"] = pd.to_datetime(wps["payment_date"])
+
+    in_period = wps[(wps["payment_date"] >= start) & (wps["payment_date"] <= end)]
+    transfers = in_period.groupby("emp_id").size().rename("transfers").reset_index()
+
+    joined = active.merge(transfers, on="emp_id", how="left")
+    missing = joined[joined["transfers"].isna()].drop(columns="transfers")
+    duplicates = transfers[transfers["transfers"] > 1].merge(
+        df_employees[["emp_id", "name", "designation", "status"]], on="emp_id", how="left"
+    )
+    unexpected = in_period.merge(active[["emp_id"]], on="emp_id", how="left", indicator=True)
+    unexpected = unexpected[unexpected["_merge"] == "left_only"].drop(columns="_merge")
+
+    previous = wps[wps["payment_date"] < start].sort_values("payment_date")
+    last_paid = previous.drop_duplicates("emp_id", keep="last").rename(
+        columns={"amount": "last_amount", "payment_date": "last_payment_date"}
+    )
+    compared = active.merge(last_paid, on="emp_id", how="inner")
+    mismatched = compared[(compared["salary"] - compared["last_amount"]).abs() >= 0.01]
+
+    return {
+        "missing": missing.reset_index(drop=True),
+        "duplicates": duplicates.reset_index(drop=True),
+        "unexpected": unexpected.reset_index(drop=True),
+        "mismatched": mismatched.reset_index(drop=True),
+        "incomplete": active[_incomplete_mask(active)].reset_index(drop=True),
+    }
+
+
+def salary_rollups(df_employees, df_wps):
+    """Per-designation and per-month salary cost from the Paid WPS transfers."""
+    wps = _paid_transfers(df_wps).merge(df_employees[["emp_id", "designation"]], on="emp_id", how="left")
+    wps["designation"] = wps["designation"].fillna("Unknown")
+    wps["month"] = pd.to_datetime(wps["payment_date"]).dt.to_period("M").astype(str)
+
+    by_designation = (
+        wps.groupby("designation")["amount"].agg(total="sum", transfers="size")
+        .reset_index().sort_values("total", ascending=False, ignore_index=True)
+    )
+    by_month = wps.groupby("month")["amount"].agg(total="sum", transfers="size").reset_index()
+    return by_designation, by_month
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from payroll import generate_wps_run, parse_period, salary_rollups, validate_wps_run, write_wps_file
+
+IBANS = ["AE070331234567890123456", "AE460090000000123456789", "AE260211000000230064016", "AE120260001015333439201"]
+
+
+@pytest.fixture
+def employees():
+    return pd.DataFrame({
+        "emp_id": [1, 2, 3, 4],
+        "name": ["A", "B", "C", "D"],
+        "designation": ["Cleaner", "Manager", "Cleaner", "Security"],
+        "salary": [1000.0, 2500.5, 1200.0, 900.0],
+        "bank_details": IBANS,
+        "joining_date": ["2023-01-01"] * 4,
+        "status": ["Active", "Active", "Active", "Inactive"],
+    })
+
+
+def test_generate_wps_run_layout(employees):
+    lines = "".join(generate_wps_run(employees, "2024-02", "EMP123", "ROUTE9", chunk_size=2)).splitlines()
+
+    assert lines[:3] == [
+        f"EDR,1,ROUTE9,{IBANS[0]},2024-02-01,2024-02-29,29,1000.00,0.00,0",
+        f"EDR,2,ROUTE9,{IBANS[1]},2024-02-01,2024-02-29,29,2500.50,0.00,0",
+        f"EDR,3,ROUTE9,{IBANS[2]},2024-02-01,2024-02-29,29,1200.00,0.00,0",
+    ]
+    scr = lines[3].split(",")
+    assert len(lines) == 4
+    assert scr[:3] == ["SCR", "EMP123", "ROUTE9"]
+    assert scr[5:] == ["022024", "3", "4700.50", "AED", "WPS-202402"]
+
+
+@pytest.mark.parametrize("period", ["bad", "2024", "2024-13", "../2024-01"])
+def test_parse_period_rejects_loose_input(period):
+    with pytest.raises(ValueError):
+        parse_period(period)
+
+
+def test_generate_wps_run_requires_config(employees):
+    with pytest.raises(ValueError):
+        next(generate_wps_run(employees, "2024-02", "", "ROUTE9"))
+    with pytest.raises(ValueError):
+        next(generate_wps_run(employees, "2024-02", "EMP123", None))
+
+
+def test_generate_wps_run_prorates_joiners(employees):
+    employees["joining_date"] = ["2023-01-01", "2024-02-20", "2024-03-01", "2023-01-01"]
+    lines = "".join(generate_wps_run(employees, "2024-02", "EMP123", "ROUTE9")).splitlines()
+
+    assert lines[:2] == [
+        f"EDR,1,ROUTE9,{IBANS[0]},2024-02-01,2024-02-29,29,1000.00,0.00,0",
+        f"EDR,2,ROUTE9,{IBANS[1]},2024-02-20,2024-02-29,10,862.24,0.00,0",
+    ]
+    assert lines[2].split(",")[6:8] == ["2", "1862.24"]
+
+
+@pytest.mark.parametrize("column, value", [
+    ("salary", np.nan),
+    ("salary", 0.0),
+    ("salary", -10.0),
+    ("bank_details", np.nan),
+    ("bank_details", "AE07,0331234567890123456"),
+    ("bank_details", "AE0703312345\n67890123456"),
+    ("bank_details", "not-an-iban"),
+    ("joining_date", np.nan),
+])
+def test_generate_wps_run_rejects_incomplete_employees(employees, column, value):
+    employees[column] = employees[column].astype(object)
+    employees.loc[1, column] = value
+    with pytest.raises(ValueError, match="1 active employee"):
+        next(generate_wps_run(employees, "2024-02", "EMP123", "ROUTE9"))
+    no_transfers = pd.DataFrame(columns=["wps_id", "emp_id", "amount", "payment_date", "status"])
+    assert validate_wps_run(employees, no_transfers, "2024-02")["incomplete"]["emp_id"].tolist() == [2]
+
+
+def test_write_wps_file_leaves_no_file_on_error(employees, tmp_path):
+    path = tmp_path / "run.sif"
+    with pytest.raises(ValueError):
+        write_wps_file(employees, "bad", path, "EMP123", "ROUTE9")
+    assert not path.exists()
+
+    write_wps_file(employees, "2024-02", path, "EMP123", "ROUTE9")
+    assert path.read_text().count("EDR,") == 3
+
+
+def test_validate_wps_run(employees):
+    employees.loc[2, "bank_details"] = np.nan
+    wps = pd.DataFrame({
+        "wps_id": [1, 2, 3, 4, 5, 6, 7],
+        "emp_id": [1, 1, 1, 2, 3, 4, 99],
+        "amount": [1000.0, 1000.0, 1000.0, 2400.0, 1200.0, 900.0, 50.0],
+        "payment_date": [
+            "2024-01-28", "2024-02-01", "2024-02-15", "2024-01-28", "2024-02-20", "2024-02-10", "2024-02-11",
+        ],
+        "status": ["Paid", "Paid", "Paid", "Paid", "Failed", "Paid", "Paid"],
+    })
+
+    checks = validate_wps_run(employees, wps, "2024-02")
+
+    assert checks["missing"]["emp_id"].tolist() == [2, 3]
+    assert checks["duplicates"][["emp_id", "transfers"]].values.tolist() == [[1, 2]]
+    assert sorted(checks["unexpected"]["emp_id"]) == [4, 99]
+    assert checks["mismatched"]["emp_id"].tolist() == [2]
+    assert checks["incomplete"]["emp_id"].tolist() == [3]
+
+
+def test_validate_wps_run_skips_employees_not_yet_joined(employees):
+    employees["joining_date"] = ["2023-01-01", "2024-03-05", "2023-01-01", "2023-01-01"]
+    wps = pd.DataFrame({
+        "wps_id": [1, 2],
+        "emp_id": [1, 2],
+        "amount": [1000.0, 2500.5],
+        "payment_date": ["2024-02-25", "2024-02-25"],
+        "status": ["Paid", "Paid"],
+    })
+
+    checks = validate_wps_run(employees, wps, "2024-02")
+
+    assert checks["missing"]["emp_id"].tolist() == [3]
+    assert checks["unexpected"]["emp_id"].tolist() == [2]
+
+
+def test_salary_rollups_counts_paid_transfers_only(employees):
+    wps = pd.DataFrame({
+        "wps_id": [1, 2, 3, 4],
+        "emp_id": [1, 2, 3, 99],
+        "amount": [1000.0, 2500.0, 1200.0, 50.0],
+        "payment_date": ["2024-01-28", "2024-01-28", "2024-02-25", "2024-02-25"],
+        "status": ["Paid", "Paid", "Failed", "Paid"],
+    })
+
+    by_designation, by_month = salary_rollups(employees, wps)
+
+    assert by_designation.values.tolist() == [["Manager", 2500.0, 1], ["Cleaner", 1000.0, 1], ["Unknown", 50.0, 1]]
+    assert by_month.values.tolist() == [["2024-01", 3500.0, 2], ["2024-02", 50.0, 1]]